@@ -1,28 +1,45 @@
 """Batch runner for processing queued YouTube URLs."""
 
+import os
 import sys
 import time
+import shlex
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Iterator
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 QUEUE_FILE = Path(__file__).with_name("queue.txt")
 ENDPOINT = "http://localhost:8000/ingest/youtube"
 SLEEP_SECONDS = 15
 
+# Reuse one keep-alive connection to the local API for the whole queue
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+SESSION.headers["Connection"] = "keep-alive"
 
-def load_queue() -> list[str]:
+
+def load_queue() -> Iterator[str]:
     if not QUEUE_FILE.exists():
-        return []
-    lines = [line.strip() for line in QUEUE_FILE.read_text(encoding="utf-8").splitlines()]
-    return [line for line in lines if line]
+        return
+    with QUEUE_FILE.open(encoding="utf-8") as queue:
+        for line in queue:
+            url = line.strip()
+            if url:
+                yield url
 
 
 def ingest_url(url: str) -> str:
-    response = requests.post(ENDPOINT, json={"url": url}, timeout=600)
+    response = SESSION.post(ENDPOINT, json={"url": url}, timeout=600)
     response.raise_for_status()
-    payload = response.json()
+    try:
+        payload = orjson.loads(response.content)
+    except orjson.JSONDecodeError as exc:
+        raise RuntimeError(f"Ingest returned invalid JSON for {url}: {exc}") from exc
     if not payload.get("success", True):
         raise RuntimeError(f"Ingest failed for {url}: {payload}")
     title = payload.get("metadata", {}).get("title")
@@ -32,37 +49,59 @@ def ingest_url(url: str) -> str:
 
 
 def run_git_commands(title: str) -> None:
-    subprocess.run(["git", "add", "."], check=True)
-    subprocess.run(["git", "commit", "-m", f"Added notes for {title}"], check=True)
-    subprocess.run(["git", "push"], check=True)
+    message = f"Added notes for {title}"
+    if os.name == "nt":
+        # cmd.exe cannot safely quote arbitrary titles, so chain the calls instead
+        subprocess.run(["git", "add", "."], check=True)
+        subprocess.run(["git", "commit", "-m", message], check=True)
+        subprocess.run(["git", "push"], check=True)
+        return
+    # Single shell invocation: one fork/exec per URL instead of three
+    command = f"git add . && git commit -m {shlex.quote(message)} && git push"
+    subprocess.run(["bash", "-c", command], check=True)
+
+
+def wait_for_git(url: str, title: str, future: Future) -> bool:
+    try:
+        future.result()
+    except subprocess.CalledProcessError as exc:
+        print(f"Git command failed for {url}: {exc}", file=sys.stderr)
+        return False
+    print(f"✅ {title} Done")
+    return True
 
 
 def main() -> int:
-    urls = load_queue()
-    if not urls:
-        print("No URLs found in queue.txt")
-        return 0
-
-    total = len(urls)
-    for index, url in enumerate(urls, start=1):
-        try:
-            title = ingest_url(url)
-            run_git_commands(title)
-        except requests.RequestException as exc:
-            print(f"Failed to ingest {url}: {exc}", file=sys.stderr)
-            continue
-        except subprocess.CalledProcessError as exc:
-            print(f"Git command failed for {url}: {exc}", file=sys.stderr)
+    index = 0
+    pending = None
+    # Ingest stays serial; git for URL N runs during the cooldown only, and must
+    # finish before URL N+1's ingest writes into the tree
+    with ThreadPoolExecutor(max_workers=1) as git_worker:
+        for index, url in enumerate(load_queue(), start=1):
+            if index > 1:
+                time.sleep(SLEEP_SECONDS)
+
+            if pending is not None:
+                if not wait_for_git(*pending):
+                    return 1
+                pending = None
+
+            try:
+                title = ingest_url(url)
+            except requests.RequestException as exc:
+                print(f"Failed to ingest {url}: {exc}", file=sys.stderr)
+                continue
+            except RuntimeError as exc:
+                print(str(exc), file=sys.stderr)
+                continue
+
+            pending = (url, title, git_worker.submit(run_git_commands, title))
+
+        if pending is not None and not wait_for_git(*pending):
             return 1
-        except RuntimeError as exc:
-            print(str(exc), file=sys.stderr)
-            continue
-
-        print(f"✅ {title} Done")
-
-        if index < total:
-            time.sleep(SLEEP_SECONDS)
 
+    if index == 0:
+        print("No URLs found in queue.txt")
     return 0
 
 
@@ -17,3 +17,14 @@ KNOWLEDGE_VAULT_STAGING_DIR = Path(
 KNOWLEDGE_VAULT_DIR = Path(
     os.getenv("KNOWLEDGE_VAULT_DIR", "knowledge_vault")
 )
+
+# Hard-link vault files to their staged copies instead of copying (same volume
+# only). Off by default: both names then share one file, so an in-place edit of
+# the vault note also changes the staging backup
+KNOWLEDGE_VAULT_HARDLINK = os.getenv("KNOWLEDGE_VAULT_HARDLINK", "").lower() in ("1", "true", "yes")
+
+# Batch mode: deliver vault files as periodic .tar archives (one sync upload
+# per batch instead of per file) under <vault>/batches
+KNOWLEDGE_VAULT_BATCH_MODE = os.getenv("KNOWLEDGE_VAULT_BATCH_MODE", "").lower() in ("1", "true", "yes")
+KNOWLEDGE_VAULT_BATCH_SIZE = int(os.getenv("KNOWLEDGE_VAULT_BATCH_SIZE", "32"))
+KNOWLEDGE_VAULT_BATCH_INTERVAL = float(os.getenv("KNOWLEDGE_VAULT_BATCH_INTERVAL", "10"))
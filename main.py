@@ -1,6 +1,5 @@
 """Brainweave-OS Ingestion API - FastAPI application."""
 
-import asyncio
 import logging
 import uuid
 from contextlib import asynccontextmanager
@@ -25,13 +24,28 @@ except ImportError:
 
 from models.schemas import IngestRequest, IngestResponse, ErrorResponse
 from services.transcript_service import TranscriptService
-from services.llm_service import LLMService
+from services.llm_service import get_llm_service
 from services.markdown_service import MarkdownService
 from utils.youtube import extract_video_id
+from config import (
+    KNOWLEDGE_VAULT_HARDLINK,
+    KNOWLEDGE_VAULT_BATCH_MODE,
+    KNOWLEDGE_VAULT_BATCH_SIZE,
+    KNOWLEDGE_VAULT_BATCH_INTERVAL,
+)
 
 # Request ID context variable
 request_id_var: ContextVar[str] = ContextVar("request_id", default="unknown")
 
+# Services hold no per-request state, so one instance serves every request
+_transcript_service = TranscriptService()
+_markdown_service = MarkdownService(
+    hardlink=KNOWLEDGE_VAULT_HARDLINK,
+    batch_mode=KNOWLEDGE_VAULT_BATCH_MODE,
+    batch_size=KNOWLEDGE_VAULT_BATCH_SIZE,
+    batch_interval=KNOWLEDGE_VAULT_BATCH_INTERVAL
+)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -67,6 +81,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Vault directory: {KNOWLEDGE_VAULT_DIR}")
     yield
     logger.info("Brainweave-OS Ingestion API shutting down")
+    _markdown_service.close()
 
 
 app = FastAPI(
@@ -132,8 +147,7 @@ async def ingest_youtube(request: IngestRequest):
         
         # Extract transcript
         try:
-            transcript_service = TranscriptService()
-            transcript_text, transcript_stats = await transcript_service.get_transcript(
+            transcript_text, transcript_stats = await _transcript_service.get_transcript(
                 video_id=video_id,
                 language=request.language
             )
@@ -196,9 +210,8 @@ async def ingest_youtube(request: IngestRequest):
         
         # Extract metadata using LLM
         try:
-            llm_service = LLMService(provider=request.provider)
-            metadata = await asyncio.to_thread(
-                llm_service.extract_metadata,
+            llm_service = get_llm_service(request.provider)
+            metadata = await llm_service.extract_metadata(
                 transcript_text,
                 request.url
             )
@@ -230,13 +243,14 @@ async def ingest_youtube(request: IngestRequest):
         file_save_info = None
         if request.save_markdown:
             try:
-                markdown_service = MarkdownService()
-                file_save_info = markdown_service.save_metadata(
+                file_save_info = await _markdown_service.save_metadata(
                     metadata,
                     overwrite=request.overwrite
                 )
                 if file_save_info.saved:
                     logger.info(f"Markdown file saved to vault: {file_save_info.filename}")
+                elif file_save_info.batched:
+                    logger.info(f"Markdown file staged and queued for vault batch: {file_save_info.path}")
                 else:
                     logger.warning(
                         f"Markdown file saved to staging only (vault copy failed): "
@@ -2,7 +2,7 @@
 
 from datetime import datetime 
 from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, HttpUrl, field_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
 
 
 class Chapter(BaseModel):
@@ -14,6 +14,10 @@ class Chapter(BaseModel):
 
 class MetadataSchema(BaseModel):
     """Strict metadata schema that LLM must output."""
+    # Merged chunk results are assigned onto an already-validated instance;
+    # keep assignment unvalidated so the full transcript isn't re-checked
+    model_config = ConfigDict(validate_assignment=False)
+
     title: str
     source_url: str
     source_type: Literal["youtube"] = "youtube"
@@ -61,12 +65,16 @@ class TranscriptStats(BaseModel):
 
 class FileSaveInfo(BaseModel):
     """Information about saved markdown file."""
+    # Built once per save and never mutated; frozen also makes instances hashable
+    model_config = ConfigDict(frozen=True)
+
     path: Optional[str] = None  # Final vault path (may be None if copy failed)
     filename: str
     skipped: bool = False  # True if file existed and overwrite=False
     staged_path: Optional[str] = None  # Staging directory path (always present if saved)
     saved: bool = True  # False if final vault copy failed
     error_code: Optional[str] = None  ## Error code if save failed (e.g., "FILE_LOCKED")
+    batched: bool = False  # True if queued for a vault tar batch (path is "<archive>.tar/<filename>")
 
 
 class IngestResponse(BaseModel):
@@ -1,11 +1,14 @@
 """Service modules for Brainweave-OS."""
 
 from .transcript_service import TranscriptService
-from .llm_service import LLMService
+from .llm_service import LLMService, get_llm_service
 from .markdown_service import MarkdownService
+from .io_backend import IoBackend
 
 __all__ = [
     "TranscriptService",
     "LLMService",
+    "get_llm_service",
     "MarkdownService",
+    "IoBackend",
 ]
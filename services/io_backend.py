@@ -0,0 +1,80 @@
+"""I/O backend for the staging write + vault copy pipeline."""
+
+import asyncio
+import logging
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from utils.atomic_write import atomic_write_text, copy_with_retries
+
+logger = logging.getLogger(__name__)
+
+
+class IoBackend:
+    """
+    Runs the blocking staging write and vault copy off the event loop.
+
+    Both steps are submitted as one linked job on a bounded thread pool, so a
+    save costs a single hand-off instead of one per syscall-heavy step, and the
+    vault copy only starts once the staging write has succeeded.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="vault-io")
+
+    async def _run(self, func, *args, **kwargs):
+        # Run in a copy of the caller's context (as asyncio.to_thread does),
+        # so the worker's log lines keep the request ID
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, functools.partial(ctx.run, func, *args, **kwargs)
+        )
+
+    @staticmethod
+    def _write_and_copy_sync(
+        staging_path: Path,
+        vault_path: Path,
+        content: str,
+        hardlink: bool = False
+    ) -> Optional[Exception]:
+        # No fsync on staging: the vault copy is written via temp file + os.replace
+        atomic_write_text(staging_path, content, durable=False)
+        logger.info(f"Saved to staging: {staging_path}")
+        try:
+            copy_with_retries(staging_path, vault_path, hardlink=hardlink)
+        except Exception as e:
+            return e
+        return None
+
+    async def write_and_copy(
+        self,
+        staging_path: Path,
+        vault_path: Path,
+        content: str,
+        hardlink: bool = False
+    ) -> Optional[Exception]:
+        """
+        Write content to staging, then copy it to the vault.
+
+        With hardlink=True the vault file is a hard link to the staged file
+        rather than a second copy (both directories must share a filesystem).
+
+        Raises if the staging write fails. A failed vault copy is best-effort
+        and is returned (None on success) so the caller can map it to an error code.
+        """
+        return await self._run(
+            self._write_and_copy_sync, staging_path, vault_path, content, hardlink
+        )
+
+    async def write_staging(self, staging_path: Path, content: str) -> None:
+        """Write content to staging only (raises on failure)."""
+        await self._run(atomic_write_text, staging_path, content, durable=False)
+        logger.info(f"Saved to staging: {staging_path}")
+
+
+# Shared by all MarkdownService instances
+DEFAULT_IO_BACKEND = IoBackend()
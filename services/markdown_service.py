@@ -1,18 +1,41 @@
 """Markdown file writing service with staging and atomic writes."""
 
+import re
 import logging
+import functools
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from models.schemas import MetadataSchema, FileSaveInfo
-from utils.filesystem import create_windows_safe_filename, ensure_directory_exists
+from utils.filesystem import (
+    create_windows_safe_filename,
+    ensure_directory_exists,
+    cached_exists,
+    invalidate_cached_exists,
+)
 from utils.youtube import extract_video_id
-from utils.atomic_write import atomic_write_text, copy_with_retries
 from config import KNOWLEDGE_VAULT_STAGING_DIR, KNOWLEDGE_VAULT_DIR
+from services.io_backend import IoBackend, DEFAULT_IO_BACKEND
+from services.vault_batch import VaultBatcher
 
 logger = logging.getLogger(__name__)
 
+# 11-char YouTube-style ID, used when extract_video_id can't parse the URL
+_YTID_RE = re.compile(r"[A-Za-z0-9_-]{11}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_date(date_value: Optional[str]) -> str:
+    """Format ISO8601 date string into DD-MM-YYYY."""
+    if not date_value:
+        return "Unknown"
+    try:
+        parsed_date = datetime.fromisoformat(date_value.replace("Z", "+00:00"))
+    except ValueError:
+        return "Unknown"
+    return parsed_date.strftime("%d-%m-%Y")
+
 
 class MarkdownService:
     """Service for writing structured markdown files with staging support."""
@@ -20,58 +43,62 @@ class MarkdownService:
     def __init__(
         self,
         staging_directory: Optional[Path] = None,
-        vault_directory: Optional[Path] = None
+        vault_directory: Optional[Path] = None,
+        io_backend: Optional[IoBackend] = None,
+        hardlink: bool = False,
+        batch_mode: bool = False,
+        batch_size: int = 32,
+        batch_interval: float = 10.0
     ):
         self.staging_directory = staging_directory or KNOWLEDGE_VAULT_STAGING_DIR
         self.vault_directory = vault_directory or KNOWLEDGE_VAULT_DIR
+        self.io_backend = io_backend or DEFAULT_IO_BACKEND
         ensure_directory_exists(self.staging_directory)
         ensure_directory_exists(self.vault_directory)
+        # Opt-in: the vault file is a hard link to the staged file instead of a
+        # second full write (falls back to a copy across volumes)
+        self.hardlink = hardlink
+        # Batch mode: vault delivery is one tar per batch under <vault>/batches
+        self._batcher = (
+            VaultBatcher(self.vault_directory / "batches", batch_size, batch_interval)
+            if batch_mode else None
+        )
+
+    def close(self):
+        """Flush any pending vault batch."""
+        if self._batcher is not None:
+            self._batcher.close()
     
     def _build_markdown_content(self, metadata: MetadataSchema) -> str:
         """Build markdown content from metadata."""
-        formatted_date = self._format_date(metadata.date_published)
+        formatted_date = _format_date(metadata.date_published)
         source_value = "A16z"
-        speakers = [speaker for speaker in [metadata.host] if speaker]
-        if metadata.guests:
-            speakers.extend(metadata.guests)
+        speakers = [metadata.host, *metadata.guests] if metadata.host else metadata.guests
         speakers_value = ", ".join(speakers) if speakers else "Unknown"
         topics_value = ", ".join(metadata.topics) if metadata.topics else "None"
         type_value = metadata.source_type.title() if metadata.source_type else "Unknown"
 
-        lines = [
-            f"Title: {metadata.title}",
-            f"Date: {formatted_date}",
-            f"Source: {source_value}",
-            f"Speaker(s): {speakers_value}",
-            f"Type: {type_value}",
-            f"Topics: {topics_value}",
-            "",
-            "# Summary",
-            "",
-            metadata.summary,
-            "",
-            "—----------------------",
-            "",
-            "## Transcript",
-            "",
-            metadata.transcript,
-            "",
-        ]
-
-        return "\n".join(lines)
+        # Single template: one allocation for the whole document
+        return (
+            f"Title: {metadata.title}\n"
+            f"Date: {formatted_date}\n"
+            f"Source: {source_value}\n"
+            f"Speaker(s): {speakers_value}\n"
+            f"Type: {type_value}\n"
+            f"Topics: {topics_value}\n"
+            "\n"
+            "# Summary\n"
+            "\n"
+            f"{metadata.summary}\n"
+            "\n"
+            "—----------------------\n"
+            "\n"
+            "## Transcript\n"
+            "\n"
+            f"{metadata.transcript}\n"
+        )
 
-    @staticmethod
-    def _format_date(date_value: Optional[str]) -> str:
-        """Format ISO8601 date string into DD-MM-YYYY."""
-        if not date_value:
-            return "Unknown"
-        try:
-            parsed_date = datetime.fromisoformat(date_value.replace("Z", "+00:00"))
-        except ValueError:
-            return "Unknown"
-        return parsed_date.strftime("%d-%m-%Y")
-    
-    def save_metadata(
+    async def save_metadata(
         self,
         metadata: MetadataSchema,
         overwrite: bool = False
@@ -88,18 +115,35 @@ class MarkdownService:
         try:
             video_id = extract_video_id(metadata.source_url)
         except ValueError:
-            # Fallback: use hash or timestamp
-            video_id = metadata.source_url.split("/")[-1][:11]
+            # Fallback: first ID-shaped run in the last path segment
+            tail = metadata.source_url.rsplit("/", 1)[-1]
+            match = _YTID_RE.search(tail)
+            video_id = match.group(0) if match else tail[:11]
         
         # Create filename
         filename = create_windows_safe_filename(metadata.title, video_id)
         staging_path = self.staging_directory / filename
         vault_path = self.vault_directory / filename
         
+        # Batch mode never writes vault_path (documents go into tars), but
+        # every batched document was staged first, so skip on the staged copy
+        if self._batcher is not None and not overwrite and cached_exists(staging_path):
+            logger.info(f"File already staged for a vault batch, skipping: {staging_path}")
+            return FileSaveInfo.model_construct(
+                path=None,
+                filename=filename,
+                skipped=True,
+                staged_path=str(staging_path),
+                saved=False,
+                batched=True
+            )
+        
         # Check if file exists in final vault
-        if vault_path.exists() and not overwrite:
+        if self._batcher is None and not overwrite and cached_exists(vault_path):
             logger.info(f"File already exists in vault, skipping: {vault_path}")
-            return FileSaveInfo(
+            # Skip path (most entries when re-running over a full vault): every
+            # value is a str/bool we built, so bypass validation
+            return FileSaveInfo.model_construct(
                 path=str(vault_path),
                 filename=filename,
                 skipped=True,
@@ -110,37 +154,49 @@ class MarkdownService:
         # Build markdown content
         content = self._build_markdown_content(metadata)
         
-        # Always write to staging first (this should never fail)
+        if self._batcher is not None:
+            try:
+                await self.io_backend.write_staging(staging_path, content)
+            except Exception as e:
+                logger.error(f"Failed to write to staging {staging_path}: {e}")
+                raise IOError(f"Could not write to staging directory: {e}")
+            invalidate_cached_exists(staging_path)
+            tar_path = self._batcher.add(filename, content)
+            return FileSaveInfo(
+                path=f"{tar_path}/{filename}",
+                filename=filename,
+                skipped=False,
+                staged_path=str(staging_path),
+                saved=False,  # Not in the vault until the batch is flushed
+                batched=True
+            )
+        
+        # Always write to staging first (this should never fail), then attempt
+        # to copy to final vault (best-effort, may fail due to locks)
         try:
-            atomic_write_text(staging_path, content)
-            logger.info(f"Saved to staging: {staging_path}")
+            copy_error = await self.io_backend.write_and_copy(
+                staging_path, vault_path, content, hardlink=self.hardlink
+            )
         except Exception as e:
             logger.error(f"Failed to write to staging {staging_path}: {e}")
             raise IOError(f"Could not write to staging directory: {e}")
         
-        # Attempt to copy to final vault (best-effort, may fail due to locks)
         saved_to_vault = False
         error_code = None
         
-        try:
-            # Check if file exists in vault and we're not overwriting
-            if vault_path.exists() and not overwrite:
-                logger.info(f"File exists in vault, skipping copy: {vault_path}")
-                saved_to_vault = True
-            else:
-                # Copy with retries
-                copy_with_retries(staging_path, vault_path)
-                logger.info(f"Successfully copied to vault: {vault_path}")
-                saved_to_vault = True
-        except PermissionError as e:
+        if copy_error is None:
+            invalidate_cached_exists(vault_path)
+            logger.info(f"Successfully copied to vault: {vault_path}")
+            saved_to_vault = True
+        elif isinstance(copy_error, PermissionError):
             error_code = "FILE_LOCKED"
             logger.warning(
-                f"Failed to copy to vault due to lock (staged at {staging_path}): {e}"
+                f"Failed to copy to vault due to lock (staged at {staging_path}): {copy_error}"
             )
-        except Exception as e:
+        else:
             error_code = "COPY_ERROR"
             logger.warning(
-                f"Failed to copy to vault (staged at {staging_path}): {e}"
+                f"Failed to copy to vault (staged at {staging_path}): {copy_error}"
             )
         
         return FileSaveInfo(
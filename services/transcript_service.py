@@ -1,7 +1,11 @@
 """YouTube transcript extraction service."""
 
+import re
 import asyncio
 import logging
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import (
@@ -16,18 +20,27 @@ from models.schemas import TranscriptStats
 
 logger = logging.getLogger(__name__)
 
+# youtube_transcript_api is blocking; give transcript fetches their own I/O pool
+# so concurrency isn't capped by (or competing for) the default executor
+_FETCH_POOL = ThreadPoolExecutor(max_workers=32, thread_name_prefix="transcript")
+
+_WS_RE = re.compile(r"\s+")
+
 
 class TranscriptService:
     """Service for extracting YouTube transcripts with robust error handling."""
     
     @staticmethod
-    async def get_transcript(
+    def get_transcript_sync(
         video_id: str,
         language: str = "en",
         preferred_languages: Optional[list] = None
     ) -> Tuple[str, TranscriptStats]:
         """
-        Extract transcript from YouTube video.
+        Extract transcript from YouTube video, blocking the calling thread.
+        
+        For callers already running in a worker thread (sync routes, task
+        workers); async code should await get_transcript instead.
         
         Returns:
             Tuple of (transcript_text, TranscriptStats)
@@ -43,74 +56,75 @@ class TranscriptService:
         if preferred_languages is None:
             preferred_languages = [language, "en"]
         
-        def _fetch_transcript():
-            """Synchronous transcript fetching wrapped for async execution."""
-            try:
-                # Try to get transcript in preferred languages
-                transcript_list = YouTubeTranscriptApi.get_transcript(
-                    video_id,
-                    languages=preferred_languages
-                )
-                
-                # Determine source type
-                source = "unknown"
-                detected_language = language
-                
-                # Try to get transcript info to determine if it's auto-generated
-                try:
-                    transcript_data = YouTubeTranscriptApi.list_transcripts(video_id)
-                    for transcript in transcript_data:
-                        if transcript.language_code == transcript_list[0].get('language', language):
-                            if transcript.is_generated:
-                                source = "auto"
-                            else:
-                                source = "manual"
-                            detected_language = transcript.language_code
-                            break
-                except Exception:
-                    # If we can't determine, default to "unknown"
-                    pass
-                
-                # Combine transcript segments
-                full_text = " ".join([item['text'] for item in transcript_list])
-                
-                # Add newlines between segments for readability
-                # (transcript API returns segments that may be missing punctuation)
-                cleaned_text = full_text.replace("  ", " ").strip()
-                
-                stats = TranscriptStats(
-                    character_count=len(cleaned_text),
-                    language=detected_language,
-                    source=source,
-                    segment_count=len(transcript_list)
-                )
-                
-                return cleaned_text, stats
-                
-            except TranscriptsDisabled:
-                logger.error(f"Transcripts disabled for video {video_id}")
-                raise
-            except NoTranscriptFound:
-                logger.error(f"No transcript found for video {video_id} in languages {preferred_languages}")
-                raise
-            except VideoUnavailable as e:
-                logger.error(f"Video unavailable: {video_id} - {e}")
-                raise
-            except TooManyRequests as e:
-                logger.warning(f"Rate limited for video {video_id}: {e}")
-                raise
-            except YouTubeRequestFailed as e:
-                logger.error(f"YouTube API request failed for {video_id}: {e}")
-                raise
-            except Exception as e:
-                logger.error(f"Unexpected error fetching transcript for {video_id}: {e}")
-                raise
-        
-        # Run in executor to avoid blocking event loop
-        loop = asyncio.get_event_loop()
         try:
-            transcript_text, stats = await loop.run_in_executor(None, _fetch_transcript)
-            return transcript_text, stats
+            # Select the transcript ourselves (one listing round-trip) so its
+            # language and generated/manual flag are known without re-listing
+            transcript = YouTubeTranscriptApi.list_transcripts(video_id).find_transcript(
+                preferred_languages
+            )
+            transcript_list = transcript.fetch()
+            
+            # Determine source type
+            source = "auto" if transcript.is_generated else "manual"
+            detected_language = transcript.language_code
+            
+            # Combine transcript segments and collapse any whitespace run
+            # (segments carry their own line breaks and padding) to one space
+            cleaned_text = _WS_RE.sub(
+                " ", " ".join(item['text'] for item in transcript_list)
+            ).strip()
+            
+            stats = TranscriptStats(
+                character_count=len(cleaned_text),
+                language=detected_language,
+                source=source,
+                segment_count=len(transcript_list)
+            )
+            
+            return cleaned_text, stats
+            
+        except TranscriptsDisabled:
+            logger.error(f"Transcripts disabled for video {video_id}")
+            raise
+        except NoTranscriptFound:
+            logger.error(f"No transcript found for video {video_id} in languages {preferred_languages}")
+            raise
+        except VideoUnavailable as e:
+            logger.error(f"Video unavailable: {video_id} - {e}")
+            raise
+        except TooManyRequests as e:
+            logger.warning(f"Rate limited for video {video_id}: {e}")
+            raise
+        except YouTubeRequestFailed as e:
+            logger.error(f"YouTube API request failed for {video_id}: {e}")
+            raise
         except Exception as e:
-            # Re-raise with context
+            logger.error(f"Unexpected error fetching transcript for {video_id}: {e}")
             raise
+    
+    @staticmethod
+    async def get_transcript(
+        video_id: str,
+        language: str = "en",
+        preferred_languages: Optional[list] = None
+    ) -> Tuple[str, TranscriptStats]:
+        """
+        Extract transcript from YouTube video without blocking the event loop.
+        
+        Runs get_transcript_sync on the transcript I/O pool; same return value
+        and exceptions.
+        """
+        # Run in a copy of the caller's context (as asyncio.to_thread does),
+        # so the worker's log lines keep the request ID
+        ctx = contextvars.copy_context()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _FETCH_POOL,
+            functools.partial(
+                ctx.run,
+                TranscriptService.get_transcript_sync,
+                video_id,
+                language,
+                preferred_languages
+            )
+        )
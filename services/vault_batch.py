@@ -0,0 +1,118 @@
+"""Batched vault delivery: bundle markdown files into periodic tar archives."""
+
+import io
+import os
+import time
+import logging
+import tarfile
+import itertools
+import threading
+from pathlib import Path
+from typing import Optional
+
+from utils.filesystem import ensure_directory_exists
+
+logger = logging.getLogger(__name__)
+
+_BATCH_COUNTER = itertools.count()
+
+
+class VaultBatcher:
+    """
+    Buffers markdown documents in memory and writes them to the vault as tars.
+
+    Sync clients (Google Drive, Dropbox) pay a fixed hash + upload cost per
+    file, so bulk ingestion delivers one archive every batch_size documents or
+    batch_interval seconds, whichever comes first, instead of one file each.
+    """
+
+    def __init__(self, batch_directory: Path, batch_size: int = 32, batch_interval: float = 10.0):
+        self.batch_directory = batch_directory
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        ensure_directory_exists(self.batch_directory)
+
+        self._lock = threading.Lock()
+        # Serializes flushes from the timer thread and close()
+        self._flush_lock = threading.Lock()
+        self._pending: list[tuple[str, bytes]] = []
+        self._tar_path: Optional[Path] = None
+        # Full batches waiting for the flush thread: (tar path, documents)
+        self._sealed: list[tuple[Path, list[tuple[str, bytes]]]] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="vault-batch", daemon=True)
+        self._thread.start()
+
+    def _new_tar_path(self) -> Path:
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return self.batch_directory / f"batch-{stamp}-{os.getpid()}.{next(_BATCH_COUNTER)}.tar"
+
+    def add(self, filename: str, content: str) -> Path:
+        """
+        Queue a document for the current batch.
+
+        Returns the path of the tar archive it will be written to.
+        """
+        data = content.encode("utf-8")
+        with self._lock:
+            if self._tar_path is None:
+                self._tar_path = self._new_tar_path()
+            self._pending.append((filename, data))
+            tar_path = self._tar_path
+            full = len(self._pending) >= self.batch_size
+            if full:
+                self._sealed.append((tar_path, self._pending))
+                self._pending, self._tar_path = [], None
+        if full:
+            self._wake.set()
+        return tar_path
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.batch_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write all queued documents to their tar archives in the vault."""
+        with self._flush_lock:
+            with self._lock:
+                batches = self._sealed
+                if self._pending:
+                    batches.append((self._tar_path, self._pending))
+                self._sealed, self._pending, self._tar_path = [], [], None
+            for tar_path, batch in batches:
+                try:
+                    self._write_tar(tar_path, batch)
+                except Exception as e:
+                    logger.error(
+                        f"Vault batch {tar_path} failed (files remain in staging): {e}",
+                        exc_info=True
+                    )
+
+    @staticmethod
+    def _write_tar(tar_path: Path, batch: list[tuple[str, bytes]]):
+        # Unique archive name, written under a temp name then renamed,
+        # so the sync client never picks up a partial tar
+        tmp = tar_path.with_suffix(".tar.part")
+        mtime = time.time()
+        try:
+            with tarfile.open(tmp, mode="w") as tar:
+                for filename, data in batch:
+                    info = tarfile.TarInfo(filename)
+                    info.size = len(data)
+                    info.mtime = mtime
+                    tar.addfile(info, io.BytesIO(data))
+            os.replace(tmp, tar_path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+        logger.info(f"Wrote {len(batch)} file(s) to vault batch: {tar_path}")
+
+    def close(self):
+        """Stop the timer thread and flush anything still queued."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self.flush()
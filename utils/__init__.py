@@ -1,14 +1,28 @@
 """Utility functions for Brainweave-OS."""
 
-from .youtube import extract_video_id, normalize_youtube_url
-from .filesystem import create_windows_safe_filename, ensure_directory_exists
+from .youtube import (
+    extract_video_id,
+    extract_video_ids,
+    normalize_youtube_url,
+    InvalidVideoURLError,
+)
+from .filesystem import (
+    create_windows_safe_filename,
+    ensure_directory_exists,
+    cached_exists,
+    invalidate_cached_exists,
+)
 from .atomic_write import atomic_write_text, copy_with_retries
 
 __all__ = [
     "extract_video_id",
+    "extract_video_ids",
     "normalize_youtube_url",
+    "InvalidVideoURLError",
     "create_windows_safe_filename",
     "ensure_directory_exists",
+    "cached_exists",
+    "invalidate_cached_exists",
     "atomic_write_text",
     "copy_with_retries",
 ]
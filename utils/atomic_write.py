@@ -1,15 +1,72 @@
 """Atomic file operations with Windows/Google Drive sync lock handling."""
 
 import os
+import sys
 import time
-import uuid
+import errno
+import itertools
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional
 
+if sys.platform.startswith("linux"):
+    import fcntl
+
 # Windows error codes for file locks
 LOCK_ERRNOS = {32, 5}  # WinError 32 (in use), 5 (access denied)
 
+# Process-local temp-file suffix counter; combined with the PID (read per call,
+# so forked workers differ) it is unique without generating a uuid4
+_TMP_COUNTER = itertools.count()
+
+# ioctl request number for FICLONE (reflink the whole file) on Linux
+_FICLONE = 0x40049409
+
+# errnos meaning "this kernel fast path isn't available here", not a real failure
+_FAST_COPY_UNSUPPORTED = {
+    errno.EXDEV, errno.ENOSYS, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL, errno.EBADF,
+}
+
+# errnos meaning "hard links aren't possible here", so copy instead
+_LINK_UNSUPPORTED = _FAST_COPY_UNSUPPORTED | {errno.EPERM, errno.EMLINK}
+
+
+# Parent directories already created/seen by this process, so hot-path writes
+# skip the mkdir syscalls. An entry is dropped when a write into it fails; a
+# directory removed behind our back (FileNotFoundError) is recreated and the
+# write retried once within the same call.
+_KNOWN_DIRS: set[str] = set()
+_KNOWN_DIRS_LOCK = threading.Lock()
+
+
+def _ensure_dir(directory: Path) -> None:
+    """mkdir -p, skipped for directories this process already ensured."""
+    key = str(directory)
+    if key in _KNOWN_DIRS:
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    with _KNOWN_DIRS_LOCK:
+        _KNOWN_DIRS.add(key)
+
+
+def _forget_dir(directory: Path) -> None:
+    with _KNOWN_DIRS_LOCK:
+        _KNOWN_DIRS.discard(str(directory))
+
+
+def _tmp_token() -> str:
+    """Return a suffix unique among this machine's live writers."""
+    return f"{os.getpid()}.{next(_TMP_COUNTER)}"
+
+
+def _discard(path: Path) -> None:
+    """Best-effort removal of a temp file in one syscall (missing is fine)."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
 
 def _is_windows_lock_error(e: Exception) -> bool:
     """Check if exception is a Windows file lock error."""
@@ -17,76 +74,138 @@ def _is_windows_lock_error(e: Exception) -> bool:
     return winerror in LOCK_ERRNOS
 
 
-def atomic_write_text(path: Path, content: str) -> Path:
+def atomic_write_text(path: Path, content: str, *, durable: bool = True) -> Path:
     """
     Atomically write text content to a file.
     
     Writes to a temp file, fsyncs, then atomically replaces the target.
     This ensures the file is either fully written or not present (no partial files).
+
+    With durable=False the fsync is skipped: os.replace still guarantees no
+    partial files, but the data may be lost on power failure.
     """
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(path.suffix + f".tmp.{uuid.uuid4().hex}")
+    # Binary mode: content is written as-is (LF endings) in one UTF-8 encode,
+    # skipping the text-IO layer
+    data = content.encode("utf-8")
+    _ensure_dir(path.parent)
+    try:
+        return _atomic_write_bytes(path, data, durable)
+    except FileNotFoundError:
+        # Cached parent directory was removed or remounted (the failed attempt
+        # already dropped it from _KNOWN_DIRS): recreate it and retry once
+        _ensure_dir(path.parent)
+        return _atomic_write_bytes(path, data, durable)
+
+
+def _atomic_write_bytes(path: Path, data: bytes, durable: bool) -> Path:
+    """One temp-file write + os.replace attempt; the parent must exist."""
+    tmp = path.with_suffix(path.suffix + f".tmp.{_tmp_token()}")
     
     try:
-        with open(tmp, "w", encoding="utf-8", newline="\n") as f:
-            f.write(content)
-            f.flush()
-            os.fsync(f.fileno())  # Ensure data is written to disk
+        # Unbuffered, so the whole document goes to the OS in one write() call
+        # (looping only if the kernel takes less)
+        data = memoryview(data)
+        with open(tmp, "wb", buffering=0) as f:
+            while data:
+                data = data[f.write(data):]
+            if durable:
+                os.fsync(f.fileno())  # Ensure data is written to disk
         
         # Atomic replace on same filesystem
         os.replace(tmp, path)
         return path
     except Exception:
         # Clean up temp file on error
-        if tmp.exists():
-            try:
-                tmp.unlink()
-            except Exception:
-                pass
+        _discard(tmp)
+        _forget_dir(path.parent)
         raise
 
 
+def _fast_copy(src: Path, dst: Path) -> None:
+    """
+    Copy src to dst, keeping the bytes in the kernel where possible.
+
+    On Linux tries copy_file_range (which reflinks on Btrfs/XFS), then a
+    FICLONE reflink, then falls back to shutil.copyfile.
+    """
+    if sys.platform.startswith("linux"):
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            try:
+                copied = os.copy_file_range(src_fd, dst_fd, 1 << 30)
+                # Some filesystems (and old kernels' cross-fs fallback) return 0
+                # without copying anything; only trust a 0 for an empty source
+                if copied or os.fstat(src_fd).st_size == 0:
+                    while copied:
+                        copied = os.copy_file_range(src_fd, dst_fd, 1 << 30)
+                    return
+            except OSError as e:
+                if e.errno not in _FAST_COPY_UNSUPPORTED:
+                    raise
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError as e:
+                if e.errno not in _FAST_COPY_UNSUPPORTED:
+                    raise
+    shutil.copyfile(src, dst)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """Hard-link src to dst (no data written), falling back to a copy if unsupported."""
+    try:
+        os.link(src, dst)
+    except OSError as e:
+        if e.errno not in _LINK_UNSUPPORTED:
+            raise
+        _fast_copy(src, dst)
+
+
 def copy_with_retries(
     src: Path,
     dst: Path,
     attempts: int = 8,
-    base_delay: float = 0.15
+    base_delay: float = 0.15,
+    hardlink: bool = False
 ) -> None:
     """
     Copy file with retries for Windows/Google Drive sync locks.
     
     Uses exponential backoff with jitter to handle transient lock errors.
+
+    With hardlink=True (src and dst on the same filesystem) dst becomes a hard
+    link to src instead of a copy, so the bytes are not written twice. src must
+    then only ever be replaced, never modified in place.
     """
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(dst.parent)
     
     last_err = None
+    recreated_dir = False
     for i in range(attempts):
+        # Copy to temp in destination dir, then replace (reduces partial files)
+        tmp_dst = dst.with_suffix(dst.suffix + f".copytmp.{_tmp_token()}")
         try:
-            # Copy to temp in destination dir, then replace (reduces partial files)
-            tmp_dst = dst.with_suffix(dst.suffix + f".copytmp.{uuid.uuid4().hex}")
-            shutil.copyfile(src, tmp_dst)
+            if hardlink:
+                _link_or_copy(src, tmp_dst)
+            else:
+                _fast_copy(src, tmp_dst)
             os.replace(tmp_dst, dst)
-            return
-        except PermissionError as e:
+            return  # os.replace consumed tmp_dst, nothing to clean up
+        except Exception as e:
+            _discard(tmp_dst)
+            _forget_dir(dst.parent)
             last_err = e
-            if _is_windows_lock_error(e):
-                # Backoff with a bit of jitter
-                time.sleep(base_delay * (2 ** i) + (0.02 * i))
+            if isinstance(e, FileNotFoundError) and not recreated_dir:
+                # Cached destination directory was removed or remounted
+                # (already dropped from _KNOWN_DIRS above): recreate it, retry once
+                recreated_dir = True
+                _ensure_dir(dst.parent)
                 continue
-            raise
-        except OSError as e:
-            last_err = e
             if _is_windows_lock_error(e):
+                # Backoff with a bit of jitter
                 time.sleep(base_delay * (2 ** i) + (0.02 * i))
                 continue
             raise
-        finally:
-            # Clean up temp file if it exists
-            if 'tmp_dst' in locals() and tmp_dst.exists():
-                try:
-                    tmp_dst.unlink()
-                except Exception:
-                    pass
     
     raise PermissionError(
         f"Destination file stayed locked after {attempts} attempts: {dst}"
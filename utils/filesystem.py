@@ -2,8 +2,10 @@
 
 import os
 import re
+import time
+import threading
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, time as dt_time, timedelta
 from typing import Optional
 
 
@@ -14,23 +16,53 @@ WINDOWS_RESERVED_NAMES = {
     'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
 }
 
+# Lowercase, immutable copy for the case-insensitive reserved-name check
+_WINDOWS_RESERVED_LOWER = frozenset(name.lower() for name in WINDOWS_RESERVED_NAMES)
+
 WINDOWS_INVALID_CHARS = r'<>:"/\|?*'
 
+# Map invalid chars and all Unicode whitespace (same set as regex \s) to '-'
+# in a single str.translate pass; U+3000 is the highest whitespace code point
+_SLUG_TRANS = str.maketrans({
+    **{c: '-' for c in WINDOWS_INVALID_CHARS},
+    **{chr(i): '-' for i in range(0x3001) if chr(i).isspace()},
+})
+_DASH_RE = re.compile(r'-+')
+
+# (YYYY-MM-DD, epoch seconds of the next local midnight); rebuilt once per day
+_today_cache: tuple[str, float] = ("", 0.0)
+
 
-def create_windows_safe_filename(title: str, video_id: str, max_length: int = 200) -> str:
+def _get_today() -> str:
+    """Return today's local date as YYYY-MM-DD, formatted once per day."""
+    global _today_cache
+    today, expires_at = _today_cache
+    if time.time() >= expires_at:
+        now = datetime.now()
+        next_midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min)
+        today = now.strftime("%Y-%m-%d")
+        _today_cache = (today, next_midnight.timestamp())
+    return today
+
+
+def create_windows_safe_filename(
+    title: str,
+    video_id: str,
+    max_length: int = 200,
+    today: Optional[str] = None
+) -> str:
     """
     Create a Windows-safe filename from title and video ID.
     
     Format: YYYY-MM-DD__slug__VIDEO_ID.md
+
+    Batch callers may pass `today` (YYYY-MM-DD) once instead of formatting
+    the current date on every call.
     """
-    # Create slug from title
-    slug = title.lower()
-    # Replace spaces and invalid chars with hyphens
-    slug = re.sub(rf'[{re.escape(WINDOWS_INVALID_CHARS)}\s]+', '-', slug)
-    # Remove multiple consecutive hyphens
-    slug = re.sub(r'-+', '-', slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip('-')
+    # Create slug from title: replace spaces and invalid chars with hyphens,
+    # collapse consecutive hyphens, remove leading/trailing hyphens
+    slug = title.lower().translate(_SLUG_TRANS)
+    slug = _DASH_RE.sub('-', slug).strip('-')
     # Truncate slug if too long (leave room for date, video_id, extension)
     date_prefix_len = 11  # "YYYY-MM-DD__"
     video_id_len = len(video_id) + 4  # "__VIDEO_ID.md"
@@ -39,14 +71,14 @@ def create_windows_safe_filename(title: str, video_id: str, max_length: int = 20
         slug = slug[:max_slug_len].rstrip('-')
     
     # Get today's date
-    today = datetime.now().strftime("%Y-%m-%d")
+    if today is None:
+        today = _get_today()
     
     # Construct filename
     filename = f"{today}__{slug}__{video_id}.md"
     
     # Final safety check: ensure no reserved names
-    name_without_ext = filename.rsplit('.', 1)[0]
-    if name_without_ext.upper() in WINDOWS_RESERVED_NAMES:
+    if filename[:filename.rindex('.')].lower() in _WINDOWS_RESERVED_LOWER:
         filename = f"video__{slug}__{video_id}.md"
     
     return filename
@@ -55,3 +87,29 @@ def create_windows_safe_filename(title: str, video_id: str, max_length: int = 20
 def ensure_directory_exists(directory: Path) -> None:
     """Ensure directory exists, create if it doesn't."""
     directory.mkdir(parents=True, exist_ok=True)
+
+
+# Short-lived Path.exists() results keyed by path; each miss is a stat() that
+# can take milliseconds on cloud-synced vault folders
+_STAT_CACHE: dict[str, tuple[bool, float]] = {}
+_STAT_CACHE_LOCK = threading.Lock()
+
+
+def cached_exists(path: Path, ttl: float = 5.0) -> bool:
+    """Return path.exists(), reusing a result younger than `ttl` seconds."""
+    key = str(path)
+    now = time.monotonic()
+    with _STAT_CACHE_LOCK:
+        entry = _STAT_CACHE.get(key)
+    if entry is not None and now - entry[1] < ttl:
+        return entry[0]
+    exists = path.exists()
+    with _STAT_CACHE_LOCK:
+        _STAT_CACHE[key] = (exists, now)
+    return exists
+
+
+def invalidate_cached_exists(path: Path) -> None:
+    """Drop any cached exists() result for path (call after writing it)."""
+    with _STAT_CACHE_LOCK:
+        _STAT_CACHE.pop(str(path), None)
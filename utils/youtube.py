@@ -1,9 +1,94 @@
 """YouTube URL parsing and video ID extraction utilities."""
 
 import re
-from urllib.parse import urlparse, parse_qs
+import string
+import functools
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import ParseResult, urlparse, unquote_plus, urlencode
 
+try:
+    # google-re2 is optional: a linear-time DFA engine for the hot-path pattern
+    import re2 as _fast_re
+except ImportError:
+    _fast_re = re
 
+# Every supported URL shape in one pattern: youtu.be/ID, and on youtube.com
+# watch?...v=ID (the first v anywhere in the query), embed/ID, shorts/ID and
+# v/ID. The host must start the string or follow '/', '.' or '@', so lookalike
+# hosts such as notyoutube.com don't match.
+_ID_RE = _fast_re.compile(
+    r'(?:^|[/.@])(?:youtu\.be/|youtube\.com/(?:watch\?(?:[^#]*?&)??v=|embed/|shorts/|v/))'
+    r'([A-Za-z0-9_-]{11})'
+)
+
+# Characters allowed in a video ID
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + '-_')
+
+# Hostnames (as lowercased by urlparse) that serve YouTube videos
+_YT_HOSTS = frozenset({
+    'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com', 'youtu.be',
+})
+
+# Canonical URL prefixes checked before any parsing
+_SHORT_PREFIX = 'https://youtu.be/'
+_WATCH_PREFIX = 'https://www.youtube.com/watch?v='
+
+
+class InvalidVideoURLError(ValueError):
+    """
+    No video ID could be extracted from a URL.
+
+    The message is only formatted when the exception is printed, so rejecting
+    a flood of bad URLs doesn't pay for string building.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self.url = url
+
+    def __str__(self) -> str:
+        return f"Could not extract video ID from URL: {self.url}"
+
+
+def _is_id(video_id: str) -> bool:
+    """True if video_id is exactly 11 valid ID characters."""
+    return len(video_id) == 11 and _ID_CHARS.issuperset(video_id)
+
+
+def _query_params(query: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Return the first non-empty 'v' and 'list' values of a query string.
+
+    Same values parse_qs would give for these two keys, without decoding and
+    collecting every other parameter.
+    """
+    video = playlist = None
+    for segment in query.split('&'):
+        if video is None and segment.startswith('v=') and len(segment) > 2:
+            video = unquote_plus(segment[2:])
+        elif playlist is None and segment.startswith('list=') and len(segment) > 5:
+            playlist = unquote_plus(segment[5:])
+        else:
+            continue
+        if video is not None and playlist is not None:
+            break
+    return video, playlist
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_once(url: str) -> Tuple[ParseResult, Optional[str], Optional[str]]:
+    """
+    Parse a URL and its v/list query values.
+
+    Shared (and cached) by extract_video_id and normalize_youtube_url, so a
+    URL that goes through both is only parsed once.
+    """
+    parsed = urlparse(url)
+    video, playlist = _query_params(parsed.query)
+    return parsed, video, playlist
+
+
+@functools.lru_cache(maxsize=4096)
 def extract_video_id(url: str) -> str:
     """
     Extract YouTube video ID from various URL formats.
@@ -13,64 +98,125 @@ def extract_video_id(url: str) -> str:
     - youtu.be/VIDEO_ID
     - youtube.com/shorts/VIDEO_ID
     - youtube.com/embed/VIDEO_ID
+    - youtube.com/v/VIDEO_ID
     - m.youtube.com/watch?v=VIDEO_ID
     - URLs with timestamps, playlists, and other params
+
+    Raises InvalidVideoURLError (a ValueError) if no ID is found.
+    Results are memoized; invalid URLs raise and are not cached.
     """
-    # Normalize the URL first
-    url = normalize_youtube_url(url)
+    # Fast path: canonical share and watch links need no parsing at all
+    if url.startswith(_SHORT_PREFIX):
+        video_id = url[17:28]
+        if _is_id(video_id):
+            return video_id
+    elif url.startswith(_WATCH_PREFIX):
+        video_id = url[32:43]
+        if _is_id(video_id) and url[43:44] in ('', '&', '#'):
+            return video_id
     
-    # Pattern for standard watch URLs
-    watch_pattern = r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/|youtube\.com/shorts/)([a-zA-Z0-9_-]{11})'
-    match = re.search(watch_pattern, url)
+    # Every YouTube host contains "youtu": reject anything else with one scan
+    # (lower() only runs for inputs that already failed the case-sensitive test)
+    if 'youtu' not in url and 'youtu' not in url.lower():
+        raise InvalidVideoURLError(url)
     
+    # One pass over the URL recognizes every supported shape
+    match = _ID_RE.search(url)
     if match:
         return match.group(1)
     
-    # Fallback: try parsing query params
-    parsed = urlparse(url)
-    if parsed.hostname and 'youtube.com' in parsed.hostname or 'youtu.be' in parsed.hostname:
-        if parsed.path.startswith('/shorts/'):
-            video_id = parsed.path.split('/shorts/')[1].split('/')[0]
-            if len(video_id) == 11:
-                return video_id
-        if parsed.path.startswith('/'):
-            video_id = parsed.path.lstrip('/').split('/')[0]
-            if len(video_id) == 11 and video_id.replace('-', '').replace('_', '').isalnum():
-                return video_id
-    
-    # Try query params
-    query_params = parse_qs(parsed.query)
-    if 'v' in query_params:
-        video_id = query_params['v'][0]
-        if len(video_id) == 11:
+    # Rare cases the pattern misses (upper-case hosts, bare /VIDEO_ID paths):
+    # dispatch on the parsed host and path prefix, slicing at fixed offsets
+    parsed, video, _ = _parse_once(url)
+    hostname = parsed.hostname
+    if hostname in _YT_HOSTS:
+        path = parsed.path
+        if path == '/watch':
+            video_id = (video or '')[:11]
+        elif path.startswith('/embed/'):
+            video_id = path[7:18]
+        elif path.startswith('/shorts/'):
+            video_id = path[8:19]
+        elif path.startswith('/v/'):
+            video_id = path[3:14]
+        else:
+            video_id = path[1:12] if hostname == 'youtu.be' else ''
+            if not _is_id(video_id):
+                # Bare /VIDEO_ID path segment
+                video_id = path.lstrip('/').split('/')[0]
+        if _is_id(video_id):
             return video_id
+    elif not parsed.scheme and not parsed.netloc:
+        # Schemeless "youtube.com/...": the host is the first path segment
+        hostname = urlparse('//' + parsed.path).hostname
     
-    raise ValueError(f"Could not extract video ID from URL: {url}")
+    # Try query params, on YouTube hosts only (not notyoutube.com and the like)
+    if hostname in _YT_HOSTS and video is not None and len(video) == 11:
+        return video
+    
+    raise InvalidVideoURLError(url)
+
+
+def extract_video_ids(urls: Iterable[str]) -> List[Optional[str]]:
+    """
+    Extract video IDs from many URLs (playlist imports, CSV columns).
+    
+    Returns one entry per URL, in order, with None where no ID could be
+    extracted. Repeated URLs are served from extract_video_id's cache.
+    """
+    video_ids = []
+    append = video_ids.append
+    for url in urls:
+        try:
+            append(extract_video_id(url))
+        except ValueError:
+            append(None)
+    return video_ids
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_youtube_url(url: str) -> str:
     """
     Normalize YouTube URL by removing tracking params and timestamps.
     Keeps only essential video ID.
+
+    Results are memoized.
     """
-    # Remove common tracking parameters
-    tracking_params = ['si', 'feature', 'utm_source', 'utm_medium', 'utm_campaign', 'ref']
-    
     # Parse URL
-    parsed = urlparse(url)
-    query_params = parse_qs(parsed.query)
+    parsed, video, playlist = _parse_once(url)
+    query = parsed.query
+    
+    # Already clean: the query is exactly "v=..[&list=..]" with ID-style values
+    # (nothing to decode or re-encode), and there is no fragment/params/case
+    # change for the rebuild below to drop. Return the input as-is instead of
+    # an identical copy.
+    clean_len = len(video) + 2 if video is not None else 0
+    if playlist is not None:
+        clean_len += len(playlist) + (6 if video is not None else 5)
+    if (
+        len(query) == clean_len
+        and (video is None or query.startswith('v='))
+        and (video is None or _ID_CHARS.issuperset(video))
+        and (playlist is None or _ID_CHARS.issuperset(playlist))
+        and url.startswith(parsed.scheme)
+        and url.startswith('://', len(parsed.scheme))
+        and len(url) == (
+            len(parsed.scheme) + 3 + len(parsed.netloc) + len(parsed.path)
+            + (len(query) + 1 if query else 0)
+        )
+    ):
+        return url
     
     # Keep only 'v' and 'list' params, remove others
     clean_params = {}
-    if 'v' in query_params:
-        clean_params['v'] = query_params['v'][0]
-    if 'list' in query_params:
-        clean_params['list'] = query_params['list'][0]
+    if video is not None:
+        clean_params['v'] = video
+    if playlist is not None:
+        clean_params['list'] = playlist
     
-    # Reconstruct URL
-    clean_query = '&'.join(f"{k}={v}" for k, v in clean_params.items())
+    # Reconstruct URL (values re-encoded, since _query_params decoded them)
     clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    if clean_query:
-        clean_url += f"?{clean_query}"
+    if clean_params:
+        clean_url += f"?{urlencode(clean_params)}"
     
     return clean_url